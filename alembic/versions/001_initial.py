@@ -1,5 +1,9 @@
 """Initial migration - create all tables
 
+Secondary indexes are created in the follow-up revision (concurrently, and
+after any bulk seed) so table creation and loading are never blocked by
+index builds.
+
 Revision ID: 001_initial
 Revises: 
 Create Date: 2026-01-21
@@ -23,7 +27,7 @@ def upgrade() -> None:
     op.create_table(
         'users',
         sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
-        sa.Column('email', sa.String(255), unique=True, nullable=False),
+        sa.Column('email', sa.String(255), nullable=False),
         sa.Column('phone', sa.String(20), unique=True, nullable=True),
         sa.Column('password_hash', sa.String(255), nullable=False),
         sa.Column('name', sa.String(255), nullable=False),
@@ -39,9 +43,6 @@ def upgrade() -> None:
         sa.Column('updated_at', sa.TIMESTAMP(), nullable=False, server_default=sa.func.now()),
         sa.Column('last_login_at', sa.TIMESTAMP(), nullable=True),
     )
-    op.create_index('ix_users_email', 'users', ['email'])
-    op.create_index('ix_users_phone', 'users', ['phone'])
-    op.create_index('ix_users_status', 'users', ['status'])
 
     # Create listings table
     op.create_table(
@@ -75,10 +76,6 @@ def upgrade() -> None:
         sa.Column('created_at', sa.TIMESTAMP(), nullable=False, server_default=sa.func.now()),
         sa.Column('updated_at', sa.TIMESTAMP(), nullable=False, server_default=sa.func.now()),
     )
-    op.create_index('ix_listings_status', 'listings', ['status'])
-    op.create_index('ix_listings_type', 'listings', ['type'])
-    op.create_index('ix_listings_created_at', 'listings', ['created_at'])
-    op.create_index('ix_listings_location', 'listings', ['latitude', 'longitude'])
 
     # Create conversations table
     op.create_table(
@@ -89,7 +86,6 @@ def upgrade() -> None:
         sa.Column('last_message_at', sa.TIMESTAMP(), nullable=True),
         sa.Column('created_at', sa.TIMESTAMP(), nullable=False, server_default=sa.func.now()),
     )
-    op.create_index('ix_conversations_listing_id', 'conversations', ['listing_id'])
 
     # Create messages table
     op.create_table(
@@ -104,8 +100,6 @@ def upgrade() -> None:
         sa.Column('read_at', sa.TIMESTAMP(), nullable=True),
         sa.Column('status', sa.String(20), default='sent'),
     )
-    op.create_index('ix_messages_conversation_id', 'messages', ['conversation_id'])
-    op.create_index('ix_messages_sent_at', 'messages', ['sent_at'])
 
     # Create bookmarks table (composite primary key)
     op.create_table(
@@ -129,8 +123,6 @@ def upgrade() -> None:
         sa.Column('action', sa.String(50), nullable=True),
         sa.Column('created_at', sa.TIMESTAMP(), nullable=False, server_default=sa.func.now()),
     )
-    op.create_index('ix_reports_listing_id', 'reports', ['listing_id'])
-    op.create_index('ix_reports_status', 'reports', ['status'])
 
     # Create leads table
     op.create_table(
@@ -144,10 +136,6 @@ def upgrade() -> None:
         sa.Column('created_at', sa.TIMESTAMP(), nullable=False, server_default=sa.func.now()),
         sa.Column('updated_at', sa.TIMESTAMP(), nullable=False, server_default=sa.func.now()),
     )
-    op.create_index('ix_leads_listing_id', 'leads', ['listing_id'])
-    op.create_index('ix_leads_seeker_id', 'leads', ['seeker_id'])
-    op.create_index('ix_leads_owner_id', 'leads', ['owner_id'])
-    op.create_index('ix_leads_status', 'leads', ['status'])
 
     # Create saved_searches table
     op.create_table(
@@ -159,7 +147,6 @@ def upgrade() -> None:
         sa.Column('frequency', sa.String(20), default='instant'),
         sa.Column('created_at', sa.TIMESTAMP(), nullable=False, server_default=sa.func.now()),
     )
-    op.create_index('ix_saved_searches_user_id', 'saved_searches', ['user_id'])
 
     # Create view_history table
     op.create_table(
@@ -169,7 +156,6 @@ def upgrade() -> None:
         sa.Column('listing_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('listings.id', ondelete='CASCADE'), nullable=False),
         sa.Column('viewed_at', sa.TIMESTAMP(), nullable=False, server_default=sa.func.now()),
     )
-    op.create_index('ix_view_history_user_id', 'view_history', ['user_id'])
 
     # Create user_blocks table (composite primary key)
     op.create_table(
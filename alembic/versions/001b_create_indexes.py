@@ -0,0 +1,67 @@
+"""Create secondary indexes concurrently
+
+Split from the initial revision: building indexes after the tables exist
+(and after any bulk seed) is substantially faster, and CONCURRENTLY keeps
+writes flowing on a live database.
+
+Revision ID: 001b_create_indexes
+Revises: 001_initial
+Create Date: 2026-01-21
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '001b_create_indexes'
+down_revision: Union[str, None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = [
+    ('ix_users_phone', 'users', ['phone'], {}),
+    ('ix_users_status', 'users', ['status'], {}),
+    ('ix_listings_status', 'listings', ['status'], {}),
+    ('ix_listings_type', 'listings', ['type'], {}),
+    ('ix_listings_created_at', 'listings', ['created_at'], {}),
+    ('ix_listings_location', 'listings', ['latitude', 'longitude'], {}),
+    ('ix_conversations_listing_id', 'conversations', ['listing_id'], {}),
+    ('ix_messages_conversation_id', 'messages', ['conversation_id'], {}),
+    ('ix_messages_sent_at', 'messages', ['sent_at'], {}),
+    ('ix_reports_listing_id', 'reports', ['listing_id'], {}),
+    ('ix_reports_status', 'reports', ['status'], {}),
+    ('ix_leads_listing_id', 'leads', ['listing_id'], {}),
+    ('ix_leads_seeker_id', 'leads', ['seeker_id'], {}),
+    ('ix_leads_owner_id', 'leads', ['owner_id'], {}),
+    ('ix_leads_status', 'leads', ['status'], {}),
+    ('ix_saved_searches_user_id', 'saved_searches', ['user_id'], {}),
+    ('ix_view_history_user_id', 'view_history', ['user_id'], {}),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Single case-insensitive unique index covers uniqueness and login
+        op.create_index(
+            'ux_users_email_lower',
+            'users',
+            [sa.text('lower(email)')],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        for name, table, columns, kwargs in _INDEXES:
+            op.create_index(
+                name, table, columns, postgresql_concurrently=True, **kwargs
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _columns, _kwargs in reversed(_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+        op.drop_index(
+            'ux_users_email_lower', table_name='users', postgresql_concurrently=True
+        )
@@ -0,0 +1,35 @@
+"""Store user roles as a native user_role enum array
+
+Revision ID: 003_roles_enum_array
+Revises: 002_add_token_version
+Create Date: 2026-02-10
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003_roles_enum_array'
+down_revision: Union[str, None] = '002_add_token_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE TYPE user_role AS ENUM ('seeker', 'owner', 'agent', 'admin')")
+    # Drop the text default before the cast, then restore it as an enum array
+    op.execute("ALTER TABLE users ALTER COLUMN roles DROP DEFAULT")
+    op.execute(
+        "ALTER TABLE users ALTER COLUMN roles TYPE user_role[] "
+        "USING roles::user_role[]"
+    )
+    op.execute("ALTER TABLE users ALTER COLUMN roles SET DEFAULT '{seeker}'::user_role[]")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE users ALTER COLUMN roles DROP DEFAULT")
+    op.execute("ALTER TABLE users ALTER COLUMN roles TYPE text[] USING roles::text[]")
+    op.execute("ALTER TABLE users ALTER COLUMN roles SET DEFAULT '{seeker}'")
+    op.execute("DROP TYPE user_role")
@@ -0,0 +1,40 @@
+"""Make the email index cover the login lookup
+
+Revision ID: 004_login_covering_index
+Revises: 003_roles_enum_array
+Create Date: 2026-02-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '004_login_covering_index'
+down_revision: Union[str, None] = '003_roles_enum_array'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rebuild the unique lower(email) index with INCLUDE columns so the login
+    # SELECT is an index-only scan; one index serves uniqueness and login.
+    op.drop_index('ux_users_email_lower', table_name='users')
+    op.create_index(
+        'ux_users_email_lower',
+        'users',
+        [sa.text('lower(email)')],
+        unique=True,
+        postgresql_include=[
+            'id', 'email', 'password_hash', 'roles', 'status',
+            'token_version', 'failed_login_attempts', 'locked_until',
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ux_users_email_lower', table_name='users')
+    op.create_index(
+        'ux_users_email_lower', 'users', [sa.text('lower(email)')], unique=True
+    )
@@ -0,0 +1,43 @@
+"""Replace btree timestamp indexes with BRIN
+
+Revision ID: 005_brin_timestamp_indexes
+Revises: 004_login_covering_index
+Create Date: 2026-02-24
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '005_brin_timestamp_indexes'
+down_revision: Union[str, None] = '004_login_covering_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# BRIN block-range summaries are orders of magnitude smaller than btrees and
+# near-free to maintain on append-mostly, monotonically increasing timestamps,
+# while still serving range scans.
+_BRIN = {'postgresql_using': 'brin', 'postgresql_with': {'pages_per_range': 32}}
+
+
+def upgrade() -> None:
+    op.drop_index('ix_listings_created_at', table_name='listings')
+    op.create_index('ix_listings_created_at_brin', 'listings', ['created_at'], **_BRIN)
+
+    op.drop_index('ix_messages_sent_at', table_name='messages')
+    op.create_index('ix_messages_sent_at_brin', 'messages', ['sent_at'], **_BRIN)
+
+    # viewed_at had no index at all; recently-viewed queries scan by time range
+    op.create_index('ix_view_history_viewed_at_brin', 'view_history', ['viewed_at'], **_BRIN)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_view_history_viewed_at_brin', table_name='view_history')
+
+    op.drop_index('ix_messages_sent_at_brin', table_name='messages')
+    op.create_index('ix_messages_sent_at', 'messages', ['sent_at'])
+
+    op.drop_index('ix_listings_created_at_brin', table_name='listings')
+    op.create_index('ix_listings_created_at', 'listings', ['created_at'])
@@ -0,0 +1,56 @@
+"""Generate primary-key UUIDs server-side
+
+Revision ID: 006_server_side_uuid_defaults
+Revises: 005_brin_timestamp_indexes
+Create Date: 2026-03-02
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '006_server_side_uuid_defaults'
+down_revision: Union[str, None] = '005_brin_timestamp_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables whose UUID primary keys move from Python-side uuid.uuid4 to
+# gen_random_uuid() in the database: the id no longer travels in the INSERT
+# and is returned by RETURNING instead.
+_TABLES = (
+    'users',
+    'listings',
+    'conversations',
+    'messages',
+    'reports',
+    'leads',
+    'saved_searches',
+    'view_history',
+)
+
+
+def upgrade() -> None:
+    # gen_random_uuid() is built in from PG 13; on older servers pgcrypto
+    # provides it, so only pull the extension in where it is actually needed.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF current_setting('server_version_num')::int < 130000 THEN
+                CREATE EXTENSION IF NOT EXISTS pgcrypto;
+            END IF;
+        END
+        $$
+        """
+    )
+    for table in _TABLES:
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN id SET DEFAULT gen_random_uuid()'
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(_TABLES):
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT')
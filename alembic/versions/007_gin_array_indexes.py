@@ -0,0 +1,46 @@
+"""Add GIN indexes on array columns
+
+Revision ID: 007_gin_array_indexes
+Revises: 006_server_side_uuid_defaults
+Create Date: 2026-03-09
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007_gin_array_indexes'
+down_revision: Union[str, None] = '006_server_side_uuid_defaults'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Array-membership filters (@>, = ANY) on these columns currently seq scan;
+# GIN indexes them so the planner can probe arrays directly.
+_GIN_INDEXES = (
+    ('ix_users_roles_gin', 'users', 'roles'),
+    ('ix_listings_amenities_gin', 'listings', 'amenities'),
+    ('ix_conversations_participants_gin', 'conversations', 'participants'),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY requires autocommit; the tables stay writable throughout.
+    with op.get_context().autocommit_block():
+        for name, table, column in _GIN_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(_GIN_INDEXES):
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True
+            )
@@ -0,0 +1,51 @@
+"""Add partial feed index on listings
+
+Revision ID: 008_listings_feed_index
+Revises: 007_gin_array_indexes
+Create Date: 2026-03-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '008_listings_feed_index'
+down_revision: Union[str, None] = '007_gin_array_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The feed ("active listings, newest first") reads this partial index
+    # top-down with no sort step; it also subsumes the standalone status
+    # index for the dominant status filter.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_listings_active_recent',
+            'listings',
+            [sa.text('created_at DESC')],
+            postgresql_where=sa.text("status = 'active'"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_listings_status',
+            table_name='listings',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_listings_status',
+            'listings',
+            ['status'],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_listings_active_recent',
+            table_name='listings',
+            postgresql_concurrently=True,
+        )
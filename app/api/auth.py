@@ -1,46 +1,113 @@
+import secrets
 from datetime import datetime, timedelta, timezone
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, select, text, update
 
-from app.core.dependencies import get_current_user
+from app.api.users import register_user
+from app.core.dependencies import AuthUser, get_current_user
 from app.core.security import (
-    verify_password,
+    verify_password_async,
     create_access_token,
+    constant_eq,
     create_refresh_token,
+    decode_sub,
     decode_token,
-    hash_password,
-    create_password_reset_token,
-    decode_password_reset_token,
+    hash_password_async,
+    password_needs_rehash,
 )
 from app.database import get_db
 from app.models.user import User
+from app.redis import get_redis
 from app.schemas.auth import (
     Token,
     LoginRequest,
     RefreshTokenRequest,
+    RegisterLoginResponse,
     PasswordResetRequest,
     PasswordResetConfirm,
     ChangePasswordRequest,
 )
+from app.schemas.user import UserCreate
 
 router = APIRouter(prefix="/api/v1/auth", tags=["authentication"])
 
+# Statements for the login hot path, built once at import time so SQLAlchemy's
+# compilation cache and asyncpg's prepared-statement cache are always reused.
+_LOGIN_LOOKUP = select(
+    User.id,
+    User.email,
+    User.password_hash,
+    User.roles,
+    User.status,
+    User.token_version,
+    User.failed_login_attempts,
+    User.locked_until,
+).where(func.lower(User.email) == bindparam("email"))
+
+_LOGIN_SUCCESS = (
+    update(User)
+    .where(User.id == bindparam("uid"))
+    .values(failed_login_attempts=0, locked_until=None, last_login_at=func.now())
+)
+
+_LOGIN_SUCCESS_REHASH = _LOGIN_SUCCESS.values(password_hash=bindparam("new_hash"))
+
+_SEL_USER_BY_EMAIL = select(User).where(func.lower(User.email) == bindparam("email"))
+
+_SEL_USER_BY_ID = select(User).where(User.id == bindparam("uid"))
+
+_SEL_TOKEN_FIELDS_BY_ID = select(
+    User.id, User.email, User.roles, User.status, User.token_version
+).where(User.id == bindparam("uid"))
+
+# Failed-login tracking lives in Redis: INCR is sub-millisecond and avoids a
+# WAL-logged Postgres write per wrong password. Postgres only sees the rare
+# lock transition below and the reset on successful login.
+_MAX_FAILED_ATTEMPTS = 5
+_LOCKOUT_SECONDS = 15 * 60
+
+# Cold write on the lock transition so the lockout survives a Redis flush
+_LOCK_ACCOUNT = (
+    update(User)
+    .where(User.id == bindparam("uid"))
+    .values(
+        failed_login_attempts=bindparam("attempts"),
+        locked_until=func.now() + text("interval '15 minutes'"),
+    )
+)
+
+
+def _failed_login_key(user_id) -> str:
+    return f"login:fail:{user_id}"
+
+
+# Password-reset tokens are opaque 128-bit values stored in Redis rather than
+# JWTs: nothing to sign or decode, and GETDEL makes them strictly single-use.
+_RESET_TOKEN_SECONDS = 15 * 60
+
+
+def _reset_key(token: str) -> str:
+    return f"reset:{token}"
+
 
 @router.post("/login", response_model=Token)
 async def login(
     credentials: LoginRequest,
     db: AsyncSession = Depends(get_db),
+    redis_conn: Redis = Depends(get_redis),
 ) -> dict:
     """
     Authenticate user with email and password.
 
     Returns JWT access and refresh tokens.
     """
-    # Find user by email
-    result = await db.execute(select(User).where(User.email == credentials.email))
-    user = result.scalar_one_or_none()
+    # Find user by email (columns only, no ORM hydration)
+    result = await db.execute(_LOGIN_LOOKUP, {"email": credentials.email})
+    user = result.first()
 
     if not user:
         raise HTTPException(
@@ -48,28 +115,32 @@ async def login(
             detail="Incorrect email or password",
         )
 
-    # Check if account is locked
-    if user.locked_until and user.locked_until > datetime.now(timezone.utc):
+    # Check if account is locked (Redis counter, with the cold DB column as
+    # a backstop in case Redis state was lost)
+    fail_key = _failed_login_key(user.id)
+    attempts = await redis_conn.get(fail_key)
+    locked = attempts is not None and int(attempts) >= _MAX_FAILED_ATTEMPTS
+    if locked or (user.locked_until and user.locked_until > datetime.now(timezone.utc)):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Account is locked due to too many failed login attempts. Try again later.",
         )
 
-    # Verify password
-    if not verify_password(credentials.password, user.password_hash):
-        # Increment failed login attempts
-        user.failed_login_attempts += 1
+    # Verify password (in a worker thread; the KDF is CPU-bound)
+    if not await verify_password_async(credentials.password, user.password_hash):
+        # Count the failure in Redis; no Postgres write, no WAL traffic
+        async with redis_conn.pipeline(transaction=True) as pipe:
+            pipe.incr(fail_key).expire(fail_key, _LOCKOUT_SECONDS)
+            attempts, _ = await pipe.execute()
 
-        # Lock account after 5 failed attempts
-        if user.failed_login_attempts >= 5:
-            user.locked_until = datetime.now(timezone.utc) + timedelta(minutes=15)
+        if attempts >= _MAX_FAILED_ATTEMPTS:
+            await db.execute(_LOCK_ACCOUNT, {"uid": user.id, "attempts": attempts})
             await db.commit()
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Account locked due to too many failed login attempts. Try again in 15 minutes.",
             )
 
-        await db.commit()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -82,15 +153,24 @@ async def login(
             detail=f"Account is {user.status}",
         )
 
-    # Reset failed login attempts on successful login
-    user.failed_login_attempts = 0
-    user.locked_until = None
-    user.last_login_at = datetime.now(timezone.utc)
+    # Clear the Redis failure counter (if any) and stamp last_login_at,
+    # upgrading legacy bcrypt hashes (or outdated argon2 parameters) in place
+    if attempts is not None:
+        await redis_conn.delete(fail_key)
+    if password_needs_rehash(user.password_hash):
+        new_hash = await hash_password_async(credentials.password)
+        await db.execute(_LOGIN_SUCCESS_REHASH, {"uid": user.id, "new_hash": new_hash})
+    else:
+        await db.execute(_LOGIN_SUCCESS, {"uid": user.id})
     await db.commit()
 
     # Create tokens
-    access_token = create_access_token(user.id, user.email, user.roles)
-    refresh_token = create_refresh_token(user.id)
+    access_token = create_access_token(
+        user.id, user.email, user.roles, user.status, user.token_version
+    )
+    refresh_token = create_refresh_token(
+        user.id, user.email, user.roles, user.status, user.token_version
+    )
 
     return {
         "access_token": access_token,
@@ -99,6 +179,38 @@ async def login(
     }
 
 
+@router.post(
+    "/register-and-login",
+    response_model=RegisterLoginResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def register_and_login(
+    user_data: UserCreate,
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    """
+    Register a new user and immediately issue a token pair.
+
+    One round trip for clients that log in right after signup; skips the
+    KDF verify a follow-up /login would cost.
+    """
+    user = await register_user(user_data, db)
+
+    access_token = create_access_token(
+        user.id, user.email, user.roles, user.status, user.token_version
+    )
+    refresh_token = create_refresh_token(
+        user.id, user.email, user.roles, user.status, user.token_version
+    )
+
+    return {
+        "user": user,
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+    }
+
+
 @router.post("/refresh", response_model=Token)
 async def refresh_access_token(
     refresh_data: RefreshTokenRequest,
@@ -109,7 +221,7 @@ async def refresh_access_token(
     """
     payload = decode_token(refresh_data.refresh_token)
 
-    if not payload or payload.get("type") != "refresh":
+    if not payload or not constant_eq(payload.get("type") or "", "refresh"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token",
@@ -122,11 +234,37 @@ async def refresh_access_token(
             detail="Invalid refresh token",
         )
 
-    # Get user from database
-    from uuid import UUID
+    if payload.get("tv") is not None:
+        # Hot path: the signed claims carry everything needed to mint a new
+        # token pair, so no database round-trip is required.
+        if payload.get("status") != "active":
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found or inactive",
+            )
+        access_token = create_access_token(
+            user_id, payload["email"], payload["roles"], payload["status"], payload["tv"]
+        )
+        refresh_token = create_refresh_token(
+            user_id, payload["email"], payload["roles"], payload["status"], payload["tv"]
+        )
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+        }
 
-    result = await db.execute(select(User).where(User.id == UUID(user_id)))
-    user = result.scalar_one_or_none()
+    # Legacy tokens without embedded claims: fall back to a database lookup.
+    # Only the columns needed to mint tokens — no ORM hydration.
+    try:
+        uid = decode_sub(user_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+    result = await db.execute(_SEL_TOKEN_FIELDS_BY_ID, {"uid": uid})
+    user = result.first()
 
     if not user or user.status != "active":
         raise HTTPException(
@@ -135,8 +273,12 @@ async def refresh_access_token(
         )
 
     # Create new tokens
-    access_token = create_access_token(user.id, user.email, user.roles)
-    refresh_token = create_refresh_token(user.id)
+    access_token = create_access_token(
+        user.id, user.email, user.roles, user.status, user.token_version
+    )
+    refresh_token = create_refresh_token(
+        user.id, user.email, user.roles, user.status, user.token_version
+    )
 
     return {
         "access_token": access_token,
@@ -147,7 +289,7 @@ async def refresh_access_token(
 
 @router.post("/logout")
 async def logout(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ) -> dict:
     """
     Logout current user.
@@ -162,6 +304,7 @@ async def logout(
 async def request_password_reset(
     reset_request: PasswordResetRequest,
     db: AsyncSession = Depends(get_db),
+    redis_conn: Redis = Depends(get_redis),
 ) -> dict:
     """
     Request a password reset token.
@@ -169,7 +312,9 @@ async def request_password_reset(
     Sends a reset token via email (email sending to be implemented).
     """
     # Find user by email
-    result = await db.execute(select(User).where(User.email == reset_request.email))
+    result = await db.execute(
+        _SEL_USER_BY_EMAIL, {"email": reset_request.email}
+    )
     user = result.scalar_one_or_none()
 
     # Always return success to prevent email enumeration
@@ -178,8 +323,12 @@ async def request_password_reset(
             "message": "If the email exists, a password reset link has been sent"
         }
 
-    # Create reset token
-    reset_token = create_password_reset_token(user.email)
+    # Opaque single-use token in Redis: no HMAC signing, shorter links, and
+    # revocable — none of which a JWT reset token can offer
+    reset_token = secrets.token_urlsafe(16)
+    await redis_conn.set(
+        _reset_key(reset_token), str(user.id), ex=_RESET_TOKEN_SECONDS
+    )
 
     # TODO: Send email with reset token
     # For now, we'll just return it (in production, this should be sent via email)
@@ -196,21 +345,22 @@ async def request_password_reset(
 async def confirm_password_reset(
     reset_confirm: PasswordResetConfirm,
     db: AsyncSession = Depends(get_db),
+    redis_conn: Redis = Depends(get_redis),
 ) -> dict:
     """
     Confirm password reset with token and new password.
     """
-    # Decode and validate token
-    email = decode_password_reset_token(reset_confirm.token)
+    # GETDEL consumes the token atomically, so it cannot be replayed
+    user_id = await redis_conn.getdel(_reset_key(reset_confirm.token))
 
-    if not email:
+    if not user_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired reset token",
         )
 
     # Find user
-    result = await db.execute(select(User).where(User.email == email))
+    result = await db.execute(_SEL_USER_BY_ID, {"uid": UUID(user_id)})
     user = result.scalar_one_or_none()
 
     if not user:
@@ -219,11 +369,12 @@ async def confirm_password_reset(
             detail="User not found",
         )
 
-    # Update password
-    user.password_hash = hash_password(reset_confirm.new_password)
+    # Update password and unlock the account
+    user.password_hash = await hash_password_async(reset_confirm.new_password)
     user.failed_login_attempts = 0
     user.locked_until = None
     await db.commit()
+    await redis_conn.delete(_failed_login_key(user.id))
 
     return {"message": "Password successfully reset"}
 
@@ -231,14 +382,20 @@ async def confirm_password_reset(
 @router.post("/change-password")
 async def change_password(
     password_change: ChangePasswordRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     """
     Change password for authenticated user.
     """
-    # Verify current password
-    if not verify_password(password_change.current_password, current_user.password_hash):
+    # current_user is built from token claims; the stored hash needs a fetch
+    result = await db.execute(_SEL_USER_BY_ID, {"uid": current_user.id})
+    user = result.scalar_one()
+
+    # Verify current password (in a worker thread; the KDF is CPU-bound)
+    if not await verify_password_async(
+        password_change.current_password, user.password_hash
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Current password is incorrect",
@@ -252,7 +409,7 @@ async def change_password(
         )
 
     # Update password
-    current_user.password_hash = hash_password(password_change.new_password)
+    user.password_hash = await hash_password_async(password_change.new_password)
     await db.commit()
 
     return {"message": "Password successfully changed"}
@@ -4,11 +4,12 @@ import uuid
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Boolean, bindparam, case, exists, func, insert, or_, select, update
 
-from app.core.dependencies import get_current_user, get_optional_current_user
-from app.core.security import hash_password
+from app.core.dependencies import AuthUser, get_current_user, get_optional_current_user
+from app.core.security import hash_password_async
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import (
@@ -21,6 +22,81 @@ from app.schemas.user import (
 
 router = APIRouter(prefix="/api/v1/users", tags=["users"])
 
+# Statements built once at import time so SQLAlchemy's compilation cache and
+# asyncpg's prepared-statement cache are always reused.
+_EXISTS_PHONE_OTHER = select(
+    exists().where(User.phone == bindparam("phone"), User.id != bindparam("uid"))
+)
+_SEL_USER_BY_ID = select(User).where(User.id == bindparam("uid"))
+_EXISTS_USER = select(exists().where(User.id == bindparam("uid")))
+
+
+def _privacy_masked(column, flag: str):
+    """Project a contact column, NULLed out by the matching privacy flag.
+
+    Owners always see their own contact info; for everyone else the flag in
+    the JSONB ``privacy_settings`` decides (absent settings mean visible).
+    """
+    hidden = func.coalesce(
+        User.privacy_settings[flag].astext.cast(Boolean), False
+    )
+    return case(
+        (or_(bindparam("is_self", type_=Boolean), hidden.is_(False)), column),
+        else_=None,
+    ).label(column.key)
+
+
+# Privacy masking pushed into the projection: the JSONB blob never crosses
+# the wire and hidden fields arrive as NULLs instead of being stripped here.
+_PROFILE_LOOKUP = select(
+    User.id,
+    User.name,
+    User.profile_photo,
+    User.bio,
+    User.roles,
+    User.verified,
+    _privacy_masked(User.email, "hide_email"),
+    _privacy_masked(User.phone, "hide_phone"),
+    User.created_at,
+).where(User.id == bindparam("uid"))
+
+# Role edits as single atomic UPDATEs with native array operators, avoiding the
+# read-modify-write race of fetching the list, mutating it and committing.
+_ADD_ROLE = (
+    update(User)
+    .where(User.id == bindparam("uid"))
+    .values(
+        roles=case(
+            (User.roles.any(bindparam("role")), User.roles),
+            else_=func.array_append(User.roles, bindparam("role")),
+        )
+    )
+    .returning(User.roles)
+)
+
+_REMOVE_ROLE = (
+    update(User)
+    .where(User.id == bindparam("uid"), User.roles.any(bindparam("role")))
+    .values(roles=func.array_remove(User.roles, bindparam("role")))
+    .returning(User.roles)
+)
+
+# INSERT ... RETURNING hands back the persisted row (server defaults included)
+# in the same round-trip, so no post-commit refresh SELECT is needed.
+_INSERT_USER = (
+    insert(User)
+    .values(
+        email=bindparam("email"),
+        phone=bindparam("phone"),
+        password_hash=bindparam("password_hash"),
+        name=bindparam("name"),
+        roles=bindparam("roles"),
+        verified=False,
+        status="active",
+    )
+    .returning(User)
+)
+
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register_user(
@@ -32,43 +108,43 @@ async def register_user(
 
     - Validates email uniqueness
     - Validates phone uniqueness (if provided)
-    - Hashes password using bcrypt
+    - Hashes password using argon2id
     - Creates user with 'seeker' role by default
     """
-    # Check if email already exists
-    result = await db.execute(select(User).where(User.email == user_data.email))
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
-        )
+    # Hash password (in a worker thread; the KDF is CPU-bound)
+    password_hash = await hash_password_async(user_data.password)
 
-    # Check if phone already exists (if provided)
-    if user_data.phone:
-        result = await db.execute(select(User).where(User.phone == user_data.phone))
-        if result.scalar_one_or_none():
+    # Create user, letting the unique constraints enforce email/phone
+    # uniqueness: the happy path is a single round-trip and there is no
+    # window for a concurrent register to slip between probe and insert.
+    try:
+        result = await db.execute(
+            _INSERT_USER,
+            {
+                "email": user_data.email,
+                "phone": user_data.phone,
+                "password_hash": password_hash,
+                "name": user_data.name,
+                "roles": ["seeker"],  # Default role
+            },
+        )
+    except IntegrityError as exc:
+        await db.rollback()
+        constraint = (
+            getattr(getattr(exc.orig, "__cause__", None), "constraint_name", None)
+            or str(exc.orig)
+        )
+        if "phone" in constraint:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Phone number already registered",
             )
-
-    # Hash password
-    password_hash = hash_password(user_data.password)
-
-    # Create user
-    new_user = User(
-        email=user_data.email,
-        phone=user_data.phone,
-        password_hash=password_hash,
-        name=user_data.name,
-        roles=["seeker"],  # Default role
-        verified=False,
-        status="active",
-    )
-
-    db.add(new_user)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
+    new_user = result.scalar_one()
     await db.commit()
-    await db.refresh(new_user)
 
     return new_user
 
@@ -76,7 +152,7 @@ async def register_user(
 @router.get("/{user_id}/profile", response_model=UserProfileResponse)
 async def get_user_profile(
     user_id: uuid.UUID,
-    current_user: Optional[User] = Depends(get_optional_current_user),
+    current_user: Optional[AuthUser] = Depends(get_optional_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> UserProfileResponse:
     """
@@ -85,44 +161,28 @@ async def get_user_profile(
     - Contact information may be hidden based on privacy settings
     - If viewing own profile, all information is visible
     """
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    is_own_profile = current_user is not None and current_user.id == user_id
+    result = await db.execute(
+        _PROFILE_LOOKUP, {"uid": user_id, "is_self": is_own_profile}
+    )
+    row = result.first()
 
-    if not user:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
 
-    # Build response based on privacy settings
-    response_data = {
-        "id": user.id,
-        "name": user.name,
-        "profile_photo": user.profile_photo,
-        "bio": user.bio,
-        "roles": user.roles,
-        "verified": user.verified,
-        "created_at": user.created_at,
-    }
-
-    # If viewing own profile or user has no privacy settings, show all info
-    is_own_profile = current_user and current_user.id == user.id
-    privacy = user.privacy_settings or {}
-
-    if is_own_profile or not privacy.get("hide_email", False):
-        response_data["email"] = user.email
-
-    if is_own_profile or not privacy.get("hide_phone", False):
-        response_data["phone"] = user.phone
-
-    return UserProfileResponse(**response_data)
+    # Row data is our own; model_construct skips the per-field validators
+    # (email/phone regexes) and leaves serialization to the response path.
+    return UserProfileResponse.model_construct(**row._mapping)
 
 
 @router.put("/{user_id}/profile", response_model=UserResponse)
 async def update_user_profile(
     user_id: uuid.UUID,
     update_data: UserUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> User:
     """
@@ -140,31 +200,36 @@ async def update_user_profile(
 
     # Validate phone uniqueness if provided
     if update_data.phone:
-        result = await db.execute(
-            select(User).where(User.phone == update_data.phone, User.id != user_id)
+        taken = await db.scalar(
+            _EXISTS_PHONE_OTHER, {"phone": update_data.phone, "uid": user_id}
         )
-        if result.scalar_one_or_none():
+        if taken:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Phone number already in use",
             )
 
-    # Update user fields
+    # Update user fields in one UPDATE ... RETURNING round-trip
     update_dict = update_data.model_dump(exclude_unset=True)
-    for key, value in update_dict.items():
-        setattr(current_user, key, value)
+    if not update_dict:
+        # current_user is claims-built and lacks full columns; fetch the row
+        result = await db.execute(_SEL_USER_BY_ID, {"uid": user_id})
+        return result.scalar_one()
 
+    result = await db.execute(
+        update(User).where(User.id == user_id).values(**update_dict).returning(User)
+    )
+    updated = result.scalar_one()
     await db.commit()
-    await db.refresh(current_user)
 
-    return current_user
+    return updated
 
 
 @router.patch("/{user_id}/profile", response_model=UserResponse)
 async def partial_update_profile(
     user_id: uuid.UUID,
     update_data: UserUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> User:
     """
@@ -177,7 +242,7 @@ async def partial_update_profile(
 async def add_user_role(
     user_id: uuid.UUID,
     role: str,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     """
@@ -187,23 +252,13 @@ async def add_user_role(
     - Valid roles: seeker, owner, agent, admin
     """
     # Check if current user is admin
-    if "admin" not in current_user.roles:
+    if "admin" not in current_user.role_set:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only admins can add roles",
         )
 
-    # Get target user
-    result = await db.execute(select(User).where(User.id == user_id))
-    target_user = result.scalar_one_or_none()
-
-    if not target_user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-
-    # Validate role
+    # Validate role before touching the database
     valid_roles = ["seeker", "owner", "agent", "admin"]
     if role not in valid_roles:
         raise HTTPException(
@@ -211,19 +266,24 @@ async def add_user_role(
             detail=f"Invalid role. Valid roles: {valid_roles}",
         )
 
-    # Add role if not already present
-    if role not in target_user.roles:
-        target_user.roles.append(role)
-        await db.commit()
+    # Append atomically in one round-trip; a no-op when the role is present
+    row = (await db.execute(_ADD_ROLE, {"uid": user_id, "role": role})).first()
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    await db.commit()
 
-    return {"message": f"Role '{role}' added to user", "roles": target_user.roles}
+    return {"message": f"Role '{role}' added to user", "roles": row.roles}
 
 
 @router.delete("/{user_id}/roles/{role}")
 async def remove_user_role(
     user_id: uuid.UUID,
     role: str,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     """
@@ -232,30 +292,26 @@ async def remove_user_role(
     - Only admins can remove roles
     """
     # Check if current user is admin
-    if "admin" not in current_user.roles:
+    if "admin" not in current_user.role_set:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only admins can remove roles",
         )
 
-    # Get target user
-    result = await db.execute(select(User).where(User.id == user_id))
-    target_user = result.scalar_one_or_none()
+    # Remove atomically in one round-trip; only matches when the role is held
+    row = (await db.execute(_REMOVE_ROLE, {"uid": user_id, "role": role})).first()
 
-    if not target_user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-
-    # Remove role if present
-    if role in target_user.roles:
-        target_user.roles.remove(role)
-        await db.commit()
-    else:
+    if not row:
+        # Cold path: distinguish a missing user from an absent role
+        if not await db.scalar(_EXISTS_USER, {"uid": user_id}):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"User does not have role '{role}'",
         )
+    await db.commit()
 
-    return {"message": f"Role '{role}' removed from user", "roles": target_user.roles}
+    return {"message": f"Role '{role}' removed from user", "roles": row.roles}
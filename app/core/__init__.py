@@ -1,17 +1,25 @@
 """Core utilities and services."""
 
 from app.core.security import (
+    constant_eq,
     hash_password,
+    hash_password_async,
     verify_password,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
+    decode_sub,
     decode_token,
 )
 
 __all__ = [
+    "constant_eq",
     "hash_password",
+    "hash_password_async",
     "verify_password",
+    "verify_password_async",
     "create_access_token",
     "create_refresh_token",
+    "decode_sub",
     "decode_token",
 ]
@@ -1,112 +1,240 @@
 """Security utilities for password hashing and JWT token handling."""
 
+import asyncio
+import base64
+import hashlib
+import hmac
+import threading
+import time
 import uuid
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
 from typing import Optional
 
 import bcrypt
-from jose import JWTError, jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import Argon2Error, InvalidHashError
+import jwt
+from cachetools import TTLCache
 
 from app.config import get_settings
 
 settings = get_settings()
 
+# Key material prepared once at import time: PyJWT takes HMAC keys as bytes,
+# so encoding here keeps the str->bytes conversion (and, for asymmetric
+# algorithms, any PEM parse) out of the per-token path.
+_SECRET_KEY = settings.jwt_secret_key
+_SIGNING_KEY = _SECRET_KEY.encode("utf-8")
+_ALGORITHM = settings.jwt_algorithm
+
+# Default token lifetimes in seconds, precomputed so minting a token costs a
+# single time.time() call instead of two aware-datetime constructions plus a
+# timedelta add. "exp" is emitted as an epoch int (JWT NumericDate).
+_ACCESS_TTL_SECONDS = settings.access_token_expire_minutes * 60
+_REFRESH_TTL_SECONDS = settings.refresh_token_expire_days * 24 * 60 * 60
+
+# Argon2id hasher for new passwords, parameters tunable per deployment
+# hardware via settings. bcrypt is kept only to verify legacy hashes;
+# those are transparently rehashed on successful login.
+_password_hasher = PasswordHasher(
+    time_cost=settings.argon2_time_cost,
+    memory_cost=settings.argon2_memory_cost,
+    parallelism=settings.argon2_parallelism,
+)
+
+# Successful verifications are cached briefly so hot service accounts that
+# log in programmatically do not burn a full KDF run per request. Keys are
+# HMAC(secret, password || hash) — no plaintext retained — and only successes
+# are stored, so a wrong password always pays the full verify. The cache is
+# reached from to_thread workers, hence the lock.
+_verify_cache: TTLCache = TTLCache(maxsize=4096, ttl=60)
+_verify_cache_lock = threading.Lock()
+
+
+def _verify_cache_key(plain_password: str, hashed_password: str) -> bytes:
+    material = plain_password.encode("utf-8") + hashed_password.encode("utf-8")
+    return hmac.new(_SIGNING_KEY, material, "sha256").digest()
+
+
+def constant_eq(a: str, b: str) -> bool:
+    """Constant-time string equality.
+
+    Use for any comparison whose branch depends on attacker-supplied input
+    (token type claims, derived secrets) so timing never reveals how far the
+    comparison got before diverging.
+    """
+    return hmac.compare_digest(a.encode("utf-8"), b.encode("utf-8"))
+
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
-    return hashed.decode("utf-8")
+    """Hash a password using argon2id."""
+    return _password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
-    return bcrypt.checkpw(
-        plain_password.encode("utf-8"), hashed_password.encode("utf-8")
-    )
+    """Verify a password against its hash (argon2id or legacy bcrypt)."""
+    cache_key = _verify_cache_key(plain_password, hashed_password)
+    with _verify_cache_lock:
+        if cache_key in _verify_cache:
+            return True
+
+    if hashed_password.startswith("$argon2"):
+        try:
+            _password_hasher.verify(hashed_password, plain_password)
+            valid = True
+        except (Argon2Error, InvalidHashError):
+            valid = False
+    else:
+        valid = bcrypt.checkpw(
+            plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+        )
+
+    if valid:
+        with _verify_cache_lock:
+            _verify_cache[cache_key] = True
+    return valid
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a stored hash should be upgraded to current parameters."""
+    if not hashed_password.startswith("$argon2"):
+        return True
+    return _password_hasher.check_needs_rehash(hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password in a worker thread so the event loop is not blocked."""
+    return await asyncio.to_thread(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in a worker thread so the event loop is not blocked."""
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+
+
+def _encode_sub(user_id) -> str:
+    """Encode a user id for the JWT ``sub`` claim.
+
+    UUIDs travel as unpadded base64url of the raw 16 bytes (22 chars vs 36
+    for the dashed form), shrinking every token. Strings pass through so a
+    subject lifted from a verified token can be re-issued as-is.
+    """
+    if isinstance(user_id, uuid.UUID):
+        return base64.urlsafe_b64encode(user_id.bytes).rstrip(b"=").decode()
+    return str(user_id)
+
+
+def _fast_uuid(s: str) -> uuid.UUID:
+    """Parse a canonical 36-char hyphenated UUID on a fixed-offset path.
+
+    uuid.UUID(str) strips braces/urn prefixes, lowercases a copy and
+    validates piecemeal — avoidable when the input came from our own token
+    issuer. Anything non-canonical falls back to the full constructor.
+    """
+    if len(s) == 36 and s[8] == "-" and s[13] == "-" and s[18] == "-" and s[23] == "-":
+        return uuid.UUID(int=int(s[:8] + s[9:13] + s[14:18] + s[19:23] + s[24:], 16))
+    return uuid.UUID(s)
+
+
+def decode_sub(sub: str) -> uuid.UUID:
+    """Decode a ``sub`` claim back to a UUID.
+
+    Accepts both the compact base64url form and the legacy dashed form so
+    tokens issued before the format change keep working until they expire.
+
+    Raises ValueError if the subject is not a valid UUID in either form.
+    """
+    if len(sub) == 22:
+        return uuid.UUID(bytes=base64.urlsafe_b64decode(sub + "=="))
+    return _fast_uuid(sub)
 
 
 def create_access_token(
     user_id: uuid.UUID,
     email: str,
     roles: list[str],
+    status: str,
+    token_version: int,
     expires_delta: Optional[timedelta] = None,
 ) -> str:
-    """Create a JWT access token."""
+    """Create a JWT access token.
+
+    Carries the authorization state (roles, status, token version) so the
+    auth dependencies can validate requests without a per-request user
+    lookup; a bumped token_version ("ver") invalidates outstanding tokens.
+    """
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        expire = int(time.time()) + int(expires_delta.total_seconds())
     else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=settings.access_token_expire_minutes
-        )
+        expire = int(time.time()) + _ACCESS_TTL_SECONDS
 
     to_encode = {
-        "sub": str(user_id),
+        "sub": _encode_sub(user_id),
         "email": email,
         "roles": roles,
+        "status": status,
+        "ver": token_version,
         "exp": expire,
+        # Unique per token so two tokens minted within the same second for
+        # the same user still differ
+        "jti": uuid.uuid4().hex,
         "type": "access",
     }
-    encoded_jwt = jwt.encode(
-        to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm
-    )
-    return encoded_jwt
+    return jwt.encode(to_encode, _SIGNING_KEY, algorithm=_ALGORITHM)
 
 
 def create_refresh_token(
     user_id: uuid.UUID,
+    email: str,
+    roles: list[str],
+    status: str,
+    token_version: int,
     expires_delta: Optional[timedelta] = None,
 ) -> str:
-    """Create a JWT refresh token."""
+    """Create a JWT refresh token.
+
+    The claims carry everything needed to mint a new token pair, so the
+    refresh endpoint can skip the per-request user lookup. token_version
+    ("tv") is bumped server-side to invalidate outstanding tokens.
+    """
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        expire = int(time.time()) + int(expires_delta.total_seconds())
     else:
-        expire = datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
+        expire = int(time.time()) + _REFRESH_TTL_SECONDS
 
     to_encode = {
-        "sub": str(user_id),
+        "sub": _encode_sub(user_id),
+        "email": email,
+        "roles": roles,
+        "status": status,
+        "tv": token_version,
         "exp": expire,
+        "jti": uuid.uuid4().hex,
         "type": "refresh",
     }
-    encoded_jwt = jwt.encode(
-        to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm
-    )
-    return encoded_jwt
-
-
-def decode_token(token: str) -> Optional[dict]:
-    """Decode a JWT token and return its payload."""
-    try:
-        payload = jwt.decode(
-            token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm]
-        )
-        return payload
-    except JWTError:
-        return None
+    return jwt.encode(to_encode, _SIGNING_KEY, algorithm=_ALGORITHM)
 
 
-def create_password_reset_token(email: str) -> str:
-    """Create a password reset token."""
-    expire = datetime.now(timezone.utc) + timedelta(hours=1)  # Reset tokens valid for 1 hour
-    to_encode = {
-        "email": email,
-        "exp": expire,
-        "type": "password_reset",
-    }
-    encoded_jwt = jwt.encode(
-        to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm
-    )
-    return encoded_jwt
+# Short-TTL cache of decoded payloads so repeated requests with the same
+# bearer skip signature verification — CPU-bound crypto on every authenticated
+# request otherwise. Keys are blake2b digests so raw tokens are never stored,
+# and the event loop is single-threaded so no lock is needed. Failures are
+# never cached; invalid tokens are re-checked every time.
+_payload_cache: TTLCache = TTLCache(maxsize=10_000, ttl=5)
 
 
-def decode_password_reset_token(token: str) -> Optional[str]:
-    """Decode a password reset token and return the email if valid."""
+def decode_token(token: str) -> Optional[dict]:
+    """Decode a JWT token and return its payload."""
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached = _payload_cache.get(key)
+    if cached is not None:
+        payload, exp = cached
+        # Honor the token's own expiry even within the cache window
+        if exp > time.time():
+            return payload
     try:
-        payload = jwt.decode(
-            token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm]
-        )
-        if payload.get("type") != "password_reset":
-            return None
-        return payload.get("email")
-    except JWTError:
+        payload = jwt.decode(token, _SIGNING_KEY, algorithms=[_ALGORITHM])
+    except jwt.PyJWTError:
         return None
+    _payload_cache[key] = (payload, payload.get("exp", 0))
+    return payload
@@ -7,13 +7,22 @@ from app.config import get_settings
 
 settings = get_settings()
 
-# Create async engine
+# Create async engine. A warm pool of 20 persistent connections absorbs the
+# steady state without TCP/TLS renegotiation; overflow covers bursts, and
+# pool_recycle retires connections before typical server/LB idle timeouts
+# kill them mid-checkout. Behind pgbouncer in transaction mode this should
+# instead use poolclass=NullPool with statement_cache_size=0, since asyncpg's
+# prepared-statement cache breaks across pooled transactions.
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30,
+    pool_recycle=1800,
+    # Room for every hoisted statement plus ad-hoc queries
+    query_cache_size=500,
 )
 
 # Session factory
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import Optional, List
 
-from sqlalchemy import String, Text, ARRAY, TIMESTAMP, ForeignKey
+from sqlalchemy import String, Text, ARRAY, TIMESTAMP, ForeignKey, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -17,7 +17,7 @@ class Conversation(Base):
     __tablename__ = "conversations"
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
     )
     listing_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("listings.id", ondelete="SET NULL"), nullable=True, index=True
@@ -32,7 +32,7 @@ class Conversation(Base):
 
     # Relationships
     listing = relationship("Listing", back_populates="conversations")
-    messages = relationship("Message", back_populates="conversation", order_by="Message.sent_at", lazy="dynamic")
+    messages = relationship("Message", back_populates="conversation", order_by="Message.sent_at")
 
     def __repr__(self) -> str:
         return f"<Conversation {self.id}>"
@@ -44,7 +44,7 @@ class Message(Base):
     __tablename__ = "messages"
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
     )
     conversation_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False, index=True
@@ -55,7 +55,7 @@ class Message(Base):
     content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     media_url: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     sent_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP, default=datetime.utcnow, nullable=False, index=True
+        TIMESTAMP, default=datetime.utcnow, nullable=False
     )
     delivered_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
     read_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
@@ -69,3 +69,20 @@ class Message(Base):
 
     def __repr__(self) -> str:
         return f"<Message {self.id}>"
+
+
+# "conversations for user Y" filters :uid = ANY(participants); GIN makes
+# that an indexed array probe instead of a seq scan.
+Index(
+    "ix_conversations_participants_gin",
+    Conversation.participants,
+    postgresql_using="gin",
+)
+
+# Append-mostly timestamp: BRIN keeps range scans cheap without btree upkeep.
+Index(
+    "ix_messages_sent_at_brin",
+    Message.sent_at,
+    postgresql_using="brin",
+    postgresql_with={"pages_per_range": 32},
+)
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import Optional, List
 
-from sqlalchemy import String, Boolean, Integer, Float, Text, ARRAY, TIMESTAMP, DECIMAL, ForeignKey
+from sqlalchemy import String, Boolean, Integer, Float, Text, ARRAY, TIMESTAMP, DECIMAL, ForeignKey, Index, func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -17,7 +17,7 @@ class Listing(Base):
     __tablename__ = "listings"
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
     )
     owner_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
@@ -49,7 +49,7 @@ class Listing(Base):
     
     # Status
     status: Mapped[str] = mapped_column(
-        String(20), default="pending_review", index=True
+        String(20), default="pending_review"
     )  # draft, pending_review, active, paused, expired, deleted
     moderation_status: Mapped[str] = mapped_column(
         String(20), default="pending"
@@ -67,7 +67,7 @@ class Listing(Base):
     # Timestamps
     expires_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP, default=datetime.utcnow, nullable=False, index=True
+        TIMESTAMP, default=datetime.utcnow, nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
@@ -75,7 +75,30 @@ class Listing(Base):
 
     # Relationships
     owner = relationship("User", back_populates="listings")
-    conversations = relationship("Conversation", back_populates="listing", lazy="dynamic")
+    conversations = relationship("Conversation", back_populates="listing")
 
     def __repr__(self) -> str:
         return f"<Listing {self.title}>"
+
+
+# BRIN suits this append-mostly timestamp: block-range summaries are orders of
+# magnitude smaller than a btree and far cheaper to maintain per insert.
+Index(
+    "ix_listings_created_at_brin",
+    Listing.created_at,
+    postgresql_using="brin",
+    postgresql_with={"pages_per_range": 32},
+)
+
+# GIN turns "listings with amenity X" (amenities @> / = ANY) from a seq scan
+# into an indexed array probe.
+Index("ix_listings_amenities_gin", Listing.amenities, postgresql_using="gin")
+
+# The feed query ("active listings, newest first") reads this partial index
+# top-down with no sort; restricting it to active rows keeps it small and
+# cache-hot, and it replaces the standalone status index.
+Index(
+    "ix_listings_active_recent",
+    Listing.created_at.desc(),
+    postgresql_where=(Listing.status == "active"),
+)
@@ -2,14 +2,21 @@
 
 import uuid
 from datetime import datetime, timezone
+from functools import cached_property
 from typing import Optional, List
 
-from sqlalchemy import String, Boolean, ARRAY, TIMESTAMP, Text
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import String, Boolean, ARRAY, TIMESTAMP, Text, Index, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ENUM
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
+# Native PG enum: each element is stored as a fixed-size oid rather than
+# variable-length text, and invalid role values are rejected by the database.
+user_role_enum = ENUM(
+    "seeker", "owner", "agent", "admin", name="user_role"
+)
+
 
 class User(Base):
     """User table model."""
@@ -17,11 +24,9 @@ class User(Base):
     __tablename__ = "users"
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
-    )
-    email: Mapped[str] = mapped_column(
-        String(255), unique=True, nullable=False, index=True
+        UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
     )
+    email: Mapped[str] = mapped_column(String(255), nullable=False)
     phone: Mapped[Optional[str]] = mapped_column(
         String(20), unique=True, nullable=True, index=True
     )
@@ -30,13 +35,15 @@ class User(Base):
     profile_photo: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     bio: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     roles: Mapped[List[str]] = mapped_column(
-        ARRAY(String), default=["seeker"], nullable=False
+        ARRAY(user_role_enum), default=["seeker"], nullable=False
     )
     verified: Mapped[bool] = mapped_column(Boolean, default=False)
     status: Mapped[str] = mapped_column(
         String(20), default="active", index=True
     )  # active, suspended, banned
     privacy_settings: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    # Bumped on status change / logout-everywhere to invalidate issued tokens
+    token_version: Mapped[int] = mapped_column(default=0, nullable=False)
     failed_login_attempts: Mapped[int] = mapped_column(default=0)
     locked_until: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
@@ -51,10 +58,43 @@ class User(Base):
     last_login_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
 
     # Relationships
-    listings = relationship("Listing", back_populates="owner", lazy="dynamic")
+    listings = relationship("Listing", back_populates="owner")
     sent_messages = relationship(
-        "Message", back_populates="sender", foreign_keys="Message.sender_id", lazy="dynamic"
+        "Message", back_populates="sender", foreign_keys="Message.sender_id"
     )
 
+    @cached_property
+    def role_set(self) -> frozenset:
+        """Roles as a frozenset, computed once per instance for O(1) checks.
+
+        The cache is per-instance; code that mutates ``roles`` in place
+        should not rely on ``role_set`` afterwards within the same request.
+        """
+        return frozenset(self.roles)
+
     def __repr__(self) -> str:
         return f"<User {self.email}>"
+
+
+# Single case-insensitive unique index serves the uniqueness constraint and
+# login lookups; INCLUDE makes the login SELECT an index-only scan so the
+# hot path never touches the heap.
+Index(
+    "ux_users_email_lower",
+    func.lower(User.email),
+    unique=True,
+    postgresql_include=[
+        "id",
+        "email",
+        "password_hash",
+        "roles",
+        "status",
+        "token_version",
+        "failed_login_attempts",
+        "locked_until",
+    ],
+)
+
+# Admin/reporting queries filter on role membership; GIN probes the enum
+# array directly. Request-path role checks stay in Python on the claims.
+Index("ix_users_roles_gin", User.roles, postgresql_using="gin")
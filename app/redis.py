@@ -0,0 +1,16 @@
+"""Redis connection and dependency."""
+
+from redis.asyncio import Redis
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Single shared client for the process; redis-py multiplexes connections
+# through its own pool, so per-request clients would only add overhead.
+redis_client = Redis.from_url(settings.redis_url, decode_responses=True)
+
+
+async def get_redis() -> Redis:
+    """Dependency for getting the shared Redis client."""
+    return redis_client
@@ -3,7 +3,9 @@
 import uuid
 from typing import Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
+
+from app.schemas.user import PhoneStr, UserResponse
 
 
 class Token(BaseModel):
@@ -14,6 +16,12 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 
+class RegisterLoginResponse(Token):
+    """Token pair plus the newly registered user."""
+
+    user: UserResponse
+
+
 class TokenData(BaseModel):
     """Data extracted from JWT token."""
 
@@ -29,18 +37,24 @@ class LoginRequest(BaseModel):
     email: EmailStr
     password: str
 
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, v: str) -> str:
+        """Canonicalize email so the login lookup compares lowercase forms."""
+        return v.strip().lower()
+
 
 class PhoneLoginRequest(BaseModel):
     """Schema for phone/OTP login."""
 
-    phone: str = Field(..., pattern=r"^\+?[1-9]\d{9,14}$")
+    phone: PhoneStr
     otp: str = Field(..., min_length=6, max_length=6)
 
 
 class OTPRequest(BaseModel):
     """Schema for requesting OTP."""
 
-    phone: str = Field(..., pattern=r"^\+?[1-9]\d{9,14}$")
+    phone: PhoneStr
 
 
 class RefreshTokenRequest(BaseModel):
@@ -54,6 +68,12 @@ class PasswordResetRequest(BaseModel):
 
     email: EmailStr
 
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, v: str) -> str:
+        """Canonicalize email to match the stored lowercase form."""
+        return v.strip().lower()
+
 
 class PasswordResetConfirm(BaseModel):
     """Schema for confirming password reset."""
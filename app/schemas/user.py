@@ -1,20 +1,31 @@
 """User Pydantic schemas for request/response validation."""
 
-import re
 import uuid
 from datetime import datetime
-from typing import Optional, List
+from typing import Annotated, Optional, List
 
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, EmailStr, Field, StringConstraints, field_validator
+
+# E.164-ish phone number, shared so the compiled matcher is cached once at
+# the type level instead of per field declaration.
+PhoneStr = Annotated[str, StringConstraints(pattern=r"^\+?[1-9]\d{9,14}$")]
+
+_SPECIAL_CHARS = frozenset('!@#$%^&*(),.?":{}|<>')
 
 
 class UserBase(BaseModel):
     """Base user schema with common fields."""
 
     email: EmailStr
-    phone: Optional[str] = Field(None, pattern=r"^\+?[1-9]\d{9,14}$")
+    phone: Optional[PhoneStr] = None
     name: str = Field(..., min_length=1, max_length=255)
 
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, v: str) -> str:
+        """Canonicalize email at the edge so stored values are lowercase."""
+        return v.strip().lower()
+
 
 class UserCreate(UserBase):
     """Schema for user registration."""
@@ -24,25 +35,39 @@ class UserCreate(UserBase):
     @field_validator("password")
     @classmethod
     def validate_password_strength(cls, v: str) -> str:
-        """Validate password meets strength requirements."""
+        """Validate password meets strength requirements.
+
+        One pass over the string with class-membership checks instead of
+        five regex scans; bails out as soon as all classes are seen.
+        """
         if len(v) < 8:
             raise ValueError("Password must be at least 8 characters long")
-        if not re.search(r"[A-Z]", v):
+        has_upper = has_lower = has_digit = has_special = False
+        for c in v:
+            if c.isupper():
+                has_upper = True
+            elif c.islower():
+                has_lower = True
+            elif c.isdigit():
+                has_digit = True
+            elif c in _SPECIAL_CHARS:
+                has_special = True
+            if has_upper and has_lower and has_digit and has_special:
+                return v
+        if not has_upper:
             raise ValueError("Password must contain at least one uppercase letter")
-        if not re.search(r"[a-z]", v):
+        if not has_lower:
             raise ValueError("Password must contain at least one lowercase letter")
-        if not re.search(r"\d", v):
+        if not has_digit:
             raise ValueError("Password must contain at least one digit")
-        if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", v):
-            raise ValueError("Password must contain at least one special character")
-        return v
+        raise ValueError("Password must contain at least one special character")
 
 
 class UserUpdate(BaseModel):
     """Schema for updating user profile."""
 
     name: Optional[str] = Field(None, min_length=1, max_length=255)
-    phone: Optional[str] = Field(None, pattern=r"^\+?[1-9]\d{9,14}$")
+    phone: Optional[PhoneStr] = None
     profile_photo: Optional[str] = None
     bio: Optional[str] = Field(None, max_length=1000)
     privacy_settings: Optional[dict] = None
@@ -1,6 +1,10 @@
 """Standard async tests for user registration and authentication with randomized data."""
 
 from typing import Dict
+import asyncio
+import os
+import random
+import secrets
 import uuid
 import re
 
@@ -12,39 +16,43 @@ from app.core.security import verify_password
 
 fake = Faker()
 
+# Bound once: saves the module-attribute lookup per draw in hot helpers
+_choice = random.choice
 
-async def generate_valid_user_data() -> Dict:
+# Property-loop example count, env-tunable like a hypothesis profile:
+# low for quick dev feedback, raised on nightly/CI runs.
+_MAX_EXAMPLES = int(os.environ.get("PROPERTY_MAX_EXAMPLES", "5"))
+
+
+def _fake_phone() -> str:
+    """Unique-enough phone without UUID/bignum/slice temporaries."""
+    return f"+1{secrets.randbelow(10**10):010d}"
+
+# Faker walks provider/locale lookups on every call; draw from pools built
+# once at import instead. Uniqueness still comes from the uuid4 components.
+_FIRST_NAMES = [fake.first_name().lower() for _ in range(200)]
+_DOMAINS = [fake.domain_name() for _ in range(100)]
+_NAMES = [fake.name() for _ in range(200)]
+
+
+def generate_valid_user_data() -> Dict:
     """Generate valid user registration data with unique fields."""
     uid = str(uuid.uuid4())[:8]
     return {
-        "email": f"user_{uid}_{fake.first_name().lower()}@{fake.domain_name()}",
-        "phone": f"+1{str(int(uuid.uuid4()))[-10:]}",
-        "name": fake.name(),
+        "email": f"user_{uid}_{_choice(_FIRST_NAMES)}@{_choice(_DOMAINS)}",
+        "phone": _fake_phone(),
+        "name": _choice(_NAMES),
         "password": f"Strong{uid}!"  # Meets all criteria
     }
 
 
+# Fixed literals: too short, no uppercase, no lowercase, no digit
+_WEAK_PASSWORDS = ("Short1!", "weakpass123!", "WEAKPASS123!", "WeakPass!")
+
+
 def generate_weak_password() -> str:
     """Generate a weak password."""
-    # Return various weak passwords
-    import random
-    options = [
-        "short",     # Too short
-        "noupper",   # No uppercase: "weakpass123!"
-        "nolower",   # No lowercase: "WEAKPASS123!"
-        "nodigit",   # No digit: "WeakPass!"
-    ]
-    choice = random.choice(options)
-    
-    if choice == "short":
-        return "Short1!"
-    elif choice == "noupper":
-        return "weakpass123!"
-    elif choice == "nolower":
-        return "WEAKPASS123!"
-    elif choice == "nodigit":
-        return "WeakPass!"
-    return "weak"
+    return _choice(_WEAK_PASSWORDS)
 
 
 # Property 1: User Registration Validity
@@ -55,12 +63,14 @@ async def test_property_valid_registration_succeeds(client: AsyncClient):
     
     Given valid registration data, registration should succeed.
     """
-    # Run 10 iterations with random data
-    for _ in range(10):
-        user_data = await generate_valid_user_data()
-        
-        response = await client.post("/api/v1/users/register", json=user_data)
-        
+    # Run 10 iterations with random data; registrations are independent,
+    # so they go out concurrently instead of paying one RTT + KDF each.
+    datas = [generate_valid_user_data() for _ in range(2 * _MAX_EXAMPLES)]
+    responses = await asyncio.gather(
+        *[client.post("/api/v1/users/register", json=d) for d in datas]
+    )
+
+    for user_data, response in zip(datas, responses):
         assert response.status_code == 201, f"Registration failed: {response.json()}"
         
         data = response.json()
@@ -85,14 +95,14 @@ async def test_property_duplicate_email_rejected(client: AsyncClient):
     """
     Property 2: Invalid Registration Rejection (Duplicate Email)
     """
-    user_data = await generate_valid_user_data()
+    user_data = generate_valid_user_data()
     
     # First registration should succeed
     response1 = await client.post("/api/v1/users/register", json=user_data)
     assert response1.status_code == 201
     
     # Second registration with same email should fail
-    user_data["phone"] = f"+1{str(int(uuid.uuid4()))[-10:]}"  # Different phone
+    user_data["phone"] = _fake_phone()  # Different phone
     response2 = await client.post("/api/v1/users/register", json=user_data)
     assert response2.status_code == 400
     assert "email" in response2.json()["detail"].lower()
@@ -103,12 +113,15 @@ async def test_property_weak_password_rejected(client: AsyncClient):
     """
     Property 2: Invalid Registration Rejection (Weak Password)
     """
-    # Run 5 iterations with weak passwords
-    for _ in range(5):
-        user_data = await generate_valid_user_data()
-        user_data["password"] = generate_weak_password()
-        
-        response = await client.post("/api/v1/users/register", json=user_data)
+    # Run 5 concurrent attempts with weak passwords
+    datas = [generate_valid_user_data() for _ in range(_MAX_EXAMPLES)]
+    for d in datas:
+        d["password"] = generate_weak_password()
+
+    responses = await asyncio.gather(
+        *[client.post("/api/v1/users/register", json=d) for d in datas]
+    )
+    for response in responses:
         assert response.status_code == 422  # Validation error
 
 
@@ -118,9 +131,9 @@ async def test_property_authentication_succeeds(client: AsyncClient):
     """
     Property 3: Authentication Success
     """
-    # Run 5 iterations
-    for _ in range(5):
-        user_data = await generate_valid_user_data()
+    # Run 5 independent register+login flows concurrently
+    async def _register_and_authenticate() -> None:
+        user_data = generate_valid_user_data()
         
         # Register user
         register_response = await client.post("/api/v1/users/register", json=user_data)
@@ -141,13 +154,17 @@ async def test_property_authentication_succeeds(client: AsyncClient):
         assert auth_data["token_type"] == "bearer"
         assert len(auth_data["access_token"]) > 0
 
+    await asyncio.gather(
+        *[_register_and_authenticate() for _ in range(_MAX_EXAMPLES)]
+    )
+
 
 @pytest.mark.asyncio
 async def test_property_wrong_password_rejected(client: AsyncClient):
     """
     Property 3: Authentication Failure (Wrong Password)
     """
-    user_data = await generate_valid_user_data()
+    user_data = generate_valid_user_data()
     
     # Register
     await client.post("/api/v1/users/register", json=user_data)
@@ -167,7 +184,7 @@ async def test_property_rate_limiting_locks_account(client: AsyncClient):
     """
     Property: Rate Limiting
     """
-    user_data = await generate_valid_user_data()
+    user_data = generate_valid_user_data()
     
     # Register user
     await client.post("/api/v1/users/register", json=user_data)